@@ -20,25 +20,33 @@ def execute_discover_archetype_models(
     if stratified_df.is_empty():
         raise MissingDataError("Dataset stratificato vuoto.")
 
-    for name, expression in defined_archetypes.items():
-        logger.info(f"Avvio analisi per l'archetipo '{name}'...")
-
-        repo_ids = stratified_df.filter(expression).get_column("repo_id").to_list()
-        if not repo_ids:
-            logger.warning(f"Nessuna repository trovata per '{name}'. Salto.")
-            continue
-        
-        logger.info(f"Trovate {len(repo_ids)} repository. Avvio ottenimento eventi...")
-        all_events_lazy = provider.build_aggregates_lazyframe(repo_ids)
-
-        logger.info(f"Avvio normalizzazione e materializzazione degli eventi...")
-        all_events_log = analyzer.prepare_log(all_events_lazy)
-
-        frequency_model: ProcessModelArtifact = analyzer.discover_heuristic_model_frequency(all_events_log)
-        performance_model: ProcessModelArtifact = analyzer.discover_heuristic_model_performance(all_events_log)
-
-        writer.save_event_log(all_events_log, archetype_name=name)
-        writer.save_model_as_pickle(frequency_model, archetype_name=name, model_type="frequency")
-        writer.save_model_as_pickle(performance_model, archetype_name=name, model_type="performance")
-        writer.save_model_visualization(frequency_model, archetype_name=name, model_type="frequency")
-        writer.save_model_visualization(performance_model, archetype_name=name, model_type="performance")
\ No newline at end of file
+    # Gli export avviati in background vanno attesi anche se un archetipo
+    # fallisce, altrimenti i loro errori andrebbero persi.
+    try:
+        for name, expression in defined_archetypes.items():
+            logger.info(f"Avvio analisi per l'archetipo '{name}'...")
+
+            repo_ids = stratified_df.filter(expression).get_column("repo_id").to_list()
+            if not repo_ids:
+                logger.warning(f"Nessuna repository trovata per '{name}'. Salto.")
+                continue
+
+            logger.info(f"Trovate {len(repo_ids)} repository. Avvio ottenimento eventi...")
+            all_events_lazy = provider.build_aggregates_lazyframe(repo_ids)
+
+            logger.info(f"Avvio normalizzazione e materializzazione degli eventi...")
+            all_events_log = analyzer.prepare_log(all_events_lazy)
+            if len(all_events_log) == 0:
+                logger.warning(f"Nessun evento core per '{name}' dopo il filtraggio. Salto la discovery.")
+                continue
+
+            frequency_model: ProcessModelArtifact = analyzer.discover_heuristic_model_frequency(all_events_log)
+            performance_model: ProcessModelArtifact = analyzer.discover_heuristic_model_performance(all_events_log)
+
+            writer.save_event_log(all_events_log, archetype_name=name)
+            writer.save_model_as_pickle(frequency_model, archetype_name=name, model_type="frequency")
+            writer.save_model_as_pickle(performance_model, archetype_name=name, model_type="performance")
+            writer.save_model_visualization(frequency_model, archetype_name=name, model_type="frequency")
+            writer.save_model_visualization(performance_model, archetype_name=name, model_type="performance")
+    finally:
+        writer.wait_for_pending_writes()
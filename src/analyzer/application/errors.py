@@ -7,6 +7,11 @@ class DataPreparationError(PipelineError):
 class MissingDataError(DataPreparationError):
     pass
 
+class ResultWriteError(PipelineError):
+    def __init__(self, message: str, errors: list):
+        super().__init__(message)
+        self.errors = errors
+
 class DomainContractError(ValueError, PipelineError):
     pass
 
@@ -119,18 +119,18 @@ def execute_structural_comparison(
     logger.info("Generazione visualizzazioni comparative (Radar, BarChart)...")
     
     if archetype_stats_records:
-        stats_df = pd.DataFrame(archetype_stats_records)
+        stats_df = pl.from_dicts(archetype_stats_records)
         
-        writer.write_dataframe_final_analysis(pl.from_pandas(stats_df), "archetypes_structural_identikit.csv")
+        writer.write_dataframe_final_analysis(stats_df, "archetypes_structural_identikit.csv")
         try:
-            writer.save_identikit_image(pl.from_pandas(stats_df), "archetypes_structural_identikit.png", "Confronto Identikit")
+            writer.save_identikit_image(stats_df, "archetypes_structural_identikit.png", "Confronto Identikit")
         except: pass
         
         radar_cols = ["Archetype", "Density", "Num_Nodes", "Num_Edges", "Cyclomatic_Complexity", "Avg_Degree"]
         available_cols = [c for c in radar_cols if c in stats_df.columns]
         
         if len(available_cols) > 1 and hasattr(writer, 'save_radar_chart'):
-            radar_df = stats_df[available_cols].copy()
+            radar_df = stats_df.select(available_cols).to_pandas()
             writer.save_radar_chart(
                 radar_df, 
                 filename="archetypes_radar_chart.png", 
@@ -77,6 +77,10 @@ class IResultWriter(ABC):
     def save_event_log(self, event_log: EventLogArtifact, archetype_name: str):
         pass
 
+    def wait_for_pending_writes(self) -> None:
+        """Attende le scritture ancora in corso; no-op per i writer sincroni."""
+        return None
+
     @abstractmethod
     def save_model_as_pickle(self, model: ProcessModelArtifact, archetype_name: str, model_type: str):
         pass
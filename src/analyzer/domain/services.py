@@ -59,33 +59,25 @@ def calculate_metrics_for_repository(
         .filter(~is_bot_actor)
     )
 
-    cumulative_sums_lf = (
-        relevant_events_lf.with_columns([
-            pl.when(pl.col("activity") == "PushEvent")
-              .then(pl.col("push_size")).otherwise(0).alias("push_volume"),
-            pl.when(popularity_predicate).then(1).otherwise(0).alias("popularity_event_count"),
-            pl.when(engagement_predicate).then(1).otherwise(0).alias("engagement_event_count"),
-        ])
+    # Unica scansione: tutte le metriche cumulative (incluso il conteggio
+    # dei collaboratori) sono aggregazioni condizionali dello stesso group_by.
+    cumulative_metrics_lf = (
+        relevant_events_lf
         .group_by("repo_id")
         .agg([
-            pl.sum("push_volume").alias("workload_cum"),
-            pl.sum("popularity_event_count").alias("external_popularity_cum"),
-            pl.sum("engagement_event_count").alias("community_engagement_cum"),
+            pl.col("push_size").filter(pl.col("activity") == "PushEvent").sum()
+              .alias("workload_cum"),
+            popularity_predicate.sum().alias("external_popularity_cum"),
+            engagement_predicate.sum().alias("community_engagement_cum"),
+            pl.col("actor_id").filter(collaboration_predicate).n_unique()
+              .alias("collaboration_intensity_cum"),
         ])
     )
 
-    collaborator_counts_lf = (
-        relevant_events_lf.filter(collaboration_predicate)
-        .group_by("repo_id")
-        .agg(pl.col("actor_id").n_unique().alias("collaboration_intensity_cum"))
-    )
-
     final_metrics_lf = (
-        cumulative_sums_lf
-        .join(collaborator_counts_lf, on="repo_id", how="left")
+        cumulative_metrics_lf
         .join(repo_creation_lookup_lf, on="repo_id", how="inner")
         .with_columns(
-            pl.col("collaboration_intensity_cum").fill_null(0),
             pl.col("repo_creation_date").dt.replace_time_zone("UTC").alias("repo_creation_date"),
                     
             (
@@ -169,13 +161,13 @@ def classify_repository(
             .alias(f"{col}_cat")
         )
 
-    lf_with_categories = metrics_lf.with_columns([categorize(c) for c in thresholds.keys()])
+    category_exprs = [categorize(c) for c in thresholds.keys()]
 
-    return lf_with_categories.with_columns(
-        pl.concat_str(
-            [pl.col(f"{c}_cat") for c in thresholds.keys()],
-            separator="|"
-        ).alias("strato_id")
+    # Categorie e strato_id nello stesso with_columns: le espressioni comuni
+    # vengono valutate una sola volta dall'ottimizzatore (CSE).
+    return metrics_lf.with_columns(
+        *category_exprs,
+        pl.concat_str(category_exprs, separator="|").alias("strato_id")
     )
 
 def report_archetype_distribution(stratified_df: pl.DataFrame) -> pl.DataFrame:
@@ -33,6 +33,10 @@ class ParquetDataProvider(IDataProvider):
         self.aggregate_model_subdirectory_name = aggregate_model_subdirectory_name
         self.archetype_process_models_directory = archetype_process_models_directory
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        # Il dataset sorgente è immutabile durante l'analisi: percorsi e scan
+        # vengono calcolati una sola volta e riutilizzati da tutti i loader.
+        self._daily_dataset_paths: Optional[List[str]] = None
+        self._source_dataset_lf: Optional[pl.LazyFrame] = None
         self.logger.info(f"ParquetDataProvider inizializzato. Dataset: {self.dataset_directory}")
 
 
@@ -144,17 +148,22 @@ class ParquetDataProvider(IDataProvider):
             if not os.path.exists(file_path):
                 raise MissingDataError(f"File dei risultati stratificati non trovato: {file_path}")
 
-            stratified_df = pl.read_parquet(file_path)
-
             required_cols = {"repo_id", "strato_id", "age_in_days"}
-            available_cols = set(stratified_df.columns)
-            missing = required_cols - available_cols
+            available_cols = list(pl.read_parquet_schema(file_path).keys())
+            missing = required_cols - set(available_cols)
             if missing:
                 self.logger.error(f"File stratificato non conforme. Colonne mancanti: {missing}")
                 raise DataPreparationError(
                     f"Schema Parquet non valido: colonne mancanti {missing} in {file_path}"
                 )
 
+            # Agli use case servono solo le chiavi e le categorie (*_cat) usate
+            # dai filtri degli archetipi: le metriche numeriche non vengono lette.
+            columns_to_read = [
+                c for c in available_cols if c in required_cols or c.endswith("_cat")
+            ]
+            stratified_df = pl.read_parquet(file_path, columns=columns_to_read)
+
             if stratified_df.is_empty():
                 self.logger.warning("Il file stratificato è stato caricato ma risulta vuoto.")
             else:
@@ -177,6 +186,9 @@ class ParquetDataProvider(IDataProvider):
         return archetype_path
     
     def _generate_daily_dataset_paths(self) -> List[str]:
+        if self._daily_dataset_paths is not None:
+            return self._daily_dataset_paths
+
         try:
             start_dt = datetime.fromisoformat(self.start_date.replace("Z", "")).date()
             end_dt = datetime.fromisoformat(self.end_date.replace("Z", "")).date()
@@ -195,9 +207,14 @@ class ParquetDataProvider(IDataProvider):
             )
             paths.append(str(pattern))
             current_date += timedelta(days=1)
+
+        self._daily_dataset_paths = paths
         return paths
     
     def _scan_source_dataset(self) -> pl.LazyFrame:
+        if self._source_dataset_lf is not None:
+            return self._source_dataset_lf
+
         try:
             date_paths = self._generate_daily_dataset_paths()
             if not date_paths:
@@ -205,7 +222,8 @@ class ParquetDataProvider(IDataProvider):
                     f"Nessun percorso file generato nel range {self.start_date} - {self.end_date}"
                 )
 
-            return pl.scan_parquet(date_paths)
+            self._source_dataset_lf = pl.scan_parquet(date_paths)
+            return self._source_dataset_lf
 
         except (ValueError, FileNotFoundError) as e:
             self.logger.error(
@@ -1,5 +1,6 @@
 import math
 import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import json
 from pathlib import Path
 import pickle
@@ -10,9 +11,8 @@ import pandas as pd
 import polars as pl
 import pm4py
 import logging
-from typing import Dict, Any, List, Optional, Union
-from pm4py.objects.log.exporter.xes import exporter as xes_exporter
-from ..application.errors import DataPreparationError
+from typing import Dict, Any, List, Optional, Set, Union
+from ..application.errors import DataPreparationError, ResultWriteError
 from ..domain.interfaces import IResultWriter
 from ..config import AnalysisConfig
 import seaborn as sns
@@ -28,15 +28,28 @@ class FileResultWriter(IResultWriter):
 
     def __init__(self, config: AnalysisConfig, logger: Optional[Union[logging.Logger, logging.LoggerAdapter]] = None):
         self.config = config
-        os.makedirs(self.config.output_directory, exist_ok=True)
+        self._created_directories: Set[str] = set()
+        # L'export XES è I/O-bound: gira in background mentre la pipeline
+        # prosegue con la discovery dell'archetipo successivo. Un solo export
+        # alla volta: ognuno trattiene l'intero log del proprio archetipo.
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xes-writer")
+        self._pending_writes: List[Future] = []
+        self._ensure_directory(self.config.output_directory)
         self.logger = logger or logging.getLogger(self.__class__.__name__)
         self.logger.info(f"FileResultWriter inizializzato. Directory di output: {self.config.output_directory}")
     
 
+    def _ensure_directory(self, directory: Union[str, Path]) -> None:
+        # Ogni artefatto passa di qui: la directory viene creata una sola volta.
+        key = str(directory)
+        if key not in self._created_directories:
+            os.makedirs(key, exist_ok=True)
+            self._created_directories.add(key)
+
     def _get_or_create_archetype_path(self, archetype_name: str) -> Path:      
         base_dir = Path(self.config.archetype_process_models_directory)
         archetype_path = base_dir / archetype_name
-        archetype_path.mkdir(parents=True, exist_ok=True)
+        self._ensure_directory(archetype_path)
         
         return archetype_path
 
@@ -46,9 +59,36 @@ class FileResultWriter(IResultWriter):
         output_path = output_dir / f"{base_filename}_log.xes"
         
         self.logger.info(f"Salvataggio dell'EventLog per '{archetype_name}' su: {output_path}")
-        
-        xes_exporter.apply(event_log, str(output_path))
-        self.logger.info("Salvataggio XES completato.")
+
+        # Prima di accodare un nuovo log si attende l'export precedente, così
+        # in memoria restano al più due log (quello in scrittura e quello
+        # corrente) invece di tutti quelli in coda. Gli errori restano nei
+        # future e vengono raccolti da wait_for_pending_writes.
+        wait(self._pending_writes)
+        self._pending_writes.append(
+            self._io_pool.submit(self._write_xes, event_log, output_path)
+        )
+
+    def _write_xes(self, event_log: Any, output_path: Path) -> None:
+        pm4py.write_xes(event_log, str(output_path))
+        self.logger.info(f"Salvataggio XES completato: {output_path}")
+
+    def wait_for_pending_writes(self) -> None:
+        pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            return
+        self.logger.info(f"Attesa del completamento di {len(pending)} scritture in background...")
+
+        # Si attendono tutte le scritture prima di segnalare errori, così
+        # nessun fallimento successivo al primo va perso.
+        wait(pending)
+        errors = [error for error in (future.exception() for future in pending) if error is not None]
+        for error in errors:
+            self.logger.error(f"Scrittura in background fallita: {error}")
+        if errors:
+            raise ResultWriteError(
+                f"{len(errors)} scritture in background su {len(pending)} fallite.", errors
+            ) from errors[0]
 
     def save_model_as_pickle(self, model: Any, archetype_name: str, model_type: str):
         if model_type not in ["frequency", "performance"]:
@@ -136,7 +176,7 @@ class FileResultWriter(IResultWriter):
     def write_dataframe_final_analysis(self, df: pl.DataFrame, filename: str) -> None:
         output_path = os.path.join(self.config.structural_comparison_directory, filename)
         self.logger.info(f"Avvio scrittura DataFrame in: {output_path}")
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self._ensure_directory(os.path.dirname(output_path))
         
         try:
             if filename.endswith(".parquet"):
@@ -186,7 +226,7 @@ class FileResultWriter(IResultWriter):
         
     def write_difference_matrix_heatmap(self, diff_matrix: pd.DataFrame, title: str, filename: str, metric: str) -> None:
             output_dir = self.config.structural_comparison_directory
-            os.makedirs(output_dir, exist_ok=True)
+            self._ensure_directory(output_dir)
             output_path = os.path.join(output_dir, filename)
             
             self.logger.info(f"Generazione heatmap della matrice di differenza in: {output_path}")
@@ -336,7 +376,7 @@ class FileResultWriter(IResultWriter):
             plt.title(title, fontsize=16, pad=20, color='#333333', weight='bold')
 
         output_path = os.path.join(self.config.structural_comparison_directory, filename)
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self._ensure_directory(os.path.dirname(output_path))
         
         plt.savefig(output_path, bbox_inches='tight', dpi=300)
         plt.close()
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from typing import Any, MutableMapping
 
 def configure_logging() -> None:
@@ -9,10 +10,23 @@ def configure_logging() -> None:
     )
 
 class LayerLoggerAdapter(logging.LoggerAdapter):
+    def __init__(self, logger: logging.Logger, extra: Any = None, *args: Any, **kwargs: Any) -> None:
+        super().__init__(logger, extra, *args, **kwargs)
+        # Il layer non cambia durante la vita dell'adapter: il prefisso si calcola una volta.
+        layer_name = self.extra.get("layer", "Generic") if self.extra else "Generic"
+        self._prefix = f"[{layer_name}] "
+
     def process(
         self,
         msg: Any,
         kwargs: MutableMapping[str, Any],
     ) -> tuple[Any, MutableMapping[str, Any]]:
-        layer_name = self.extra.get("layer", "Generic") if self.extra else "Generic"
-        return f"[{layer_name}] {msg}", kwargs
+        if isinstance(msg, str):
+            return self._prefix + msg, kwargs
+        return f"{self._prefix}{msg}", kwargs
+
+
+@lru_cache(maxsize=None)
+def get_layer_logger(name: str, layer: str) -> LayerLoggerAdapter:
+    """Restituisce un adapter condiviso per la coppia (logger, layer)."""
+    return LayerLoggerAdapter(logging.getLogger(name), {"layer": layer})
@@ -1,18 +1,16 @@
 import os
 import pickle
-import logging
 from typing import Dict, Optional, Any, Set, Tuple
 import numpy as np
 import pandas as pd
 from pm4py.objects.heuristics_net.obj import HeuristicsNet
 from ..domain.interfaces import IModelAnalyzer
-from ..infrastructure.logging_config import LayerLoggerAdapter
+from ..infrastructure.logging_config import get_layer_logger
 from ..domain.constants import ALL_POSSIBLE_ACTIVITIES
 
 class PM4PyModelAnalyzer(IModelAnalyzer):
     def __init__(self) -> None:
-        base_logger = logging.getLogger(self.__class__.__name__)
-        self.logger = LayerLoggerAdapter(base_logger, {"layer": "Infrastructure"})
+        self.logger = get_layer_logger(self.__class__.__name__, "Infrastructure")
 
     def load_model_from_file(self, file_path: str) -> Optional[HeuristicsNet]:
         try:
@@ -178,10 +176,7 @@ class PM4PyModelAnalyzer(IModelAnalyzer):
         if not model or not hasattr(model, 'nodes'):
             return 0
         
-        count = 0
-        for node_obj in model.nodes.values():
-            count += len(node_obj.output_connections)
-        return count
+        return sum(len(node_obj.output_connections) for node_obj in model.nodes.values())
 
     def get_most_frequent_activity(self, model: HeuristicsNet) -> Tuple[str, int]:
         if not model or not hasattr(model, 'nodes'):
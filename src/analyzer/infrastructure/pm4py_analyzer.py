@@ -1,21 +1,18 @@
-import logging
 import pandas as pd
 import polars as pl
 import pm4py
-from pm4py.objects.log.obj import EventLog
 from ..domain.interfaces import IProcessAnalyzer
-from ..infrastructure.logging_config import LayerLoggerAdapter
+from ..infrastructure.logging_config import get_layer_logger
 from ..domain import predicates
 from pm4py.objects.heuristics_net.obj import HeuristicsNet
 
 class PM4PyAnalyzer(IProcessAnalyzer):
 
     def __init__(self):
-        base_logger = logging.getLogger(self.__class__.__name__)
-        self.logger = LayerLoggerAdapter(base_logger, {"layer": "Infrastructure"})
+        self.logger = get_layer_logger(self.__class__.__name__, "Infrastructure")
         self.logger.info("PM4PyAnalyzer inizializzato correttamente.")
 
-    def discover_heuristic_model_frequency(self, event_log: EventLog) -> HeuristicsNet:
+    def discover_heuristic_model_frequency(self, event_log: pd.DataFrame) -> HeuristicsNet:
         self.logger.info("Avvio discovery del modello di processo (frequency) con Heuristics Miner...")
         
         heuristics_net = pm4py.discover_heuristics_net(
@@ -32,7 +29,7 @@ class PM4PyAnalyzer(IProcessAnalyzer):
         return heuristics_net
 
     
-    def discover_heuristic_model_performance(self, event_log: EventLog) -> HeuristicsNet:
+    def discover_heuristic_model_performance(self, event_log: pd.DataFrame) -> HeuristicsNet:
         self.logger.info("Avvio discovery delle performance del processo (performance) con Heuristics Miner...")   
         
         performance_heuristics_net = pm4py.discover_heuristics_net(
@@ -49,74 +46,78 @@ class PM4PyAnalyzer(IProcessAnalyzer):
         self.logger.info("Discovery delle performance completata.")
         return performance_heuristics_net
 
-    def prepare_log(self, raw_ldf: pl.LazyFrame) -> EventLog:
+    def prepare_log(self, raw_ldf: pl.LazyFrame) -> pd.DataFrame:
         ldf_no_bots = raw_ldf.filter(~predicates.is_bot_actor)
         ldf_core_events = ldf_no_bots.filter(predicates.is_core_workflow_event)
         ldf_normalized = _normalize_event_names(ldf_core_events)
 
+        # Il timestamp del dataset è già Datetime: il cast (e la conversione
+        # lato pandas) serve solo se la sorgente lo espone come stringa.
+        timestamp = pl.col("timestamp")
+        if not isinstance(ldf_normalized.collect_schema()["timestamp"], pl.Datetime):
+            timestamp = timestamp.cast(pl.Utf8).str.to_datetime(time_zone="UTC")
+
         ldf_pm4py_format = ldf_normalized.select(
             #  Case ID = Attore + Repo
             (pl.col("actor_id").cast(pl.Utf8) + "_" + pl.col("repo_id").cast(pl.Utf8)).alias("case:concept:name"), 
             pl.col("concept:name"),                       
-            pl.col("timestamp").alias("time:timestamp"),  
+            timestamp.alias("time:timestamp"),
             pl.col("actor_login").alias("org:resource")   
         )
 
         self.logger.info("Avvio materializzazione del log per PM4Py...")
         
-        pandas_df = ldf_pm4py_format.collect().to_pandas()
-        pandas_df['time:timestamp'] = pd.to_datetime(pandas_df['time:timestamp'])
-        event_log = pm4py.convert_to_event_log(pandas_df)
+        # PM4Py lavora direttamente sul DataFrame nel formato standard
+        # (case:concept:name, concept:name, time:timestamp): non serve
+        # materializzare un EventLog traccia per traccia.
+        pandas_df = ldf_pm4py_format.collect(engine="streaming").to_pandas()
         
         self.logger.info(f"Log PM4Py creato con successo. Numero di eventi: {len(pandas_df)}")
 
-        return event_log
+        return pandas_df
+
+_ACTIVITIES_WITH_SUFFIX = [
+    "PullRequestEvent",
+    "IssuesEvent",
+    "PullRequestReviewEvent",
+    "IssueCommentEvent",
+    "PullRequestReviewCommentEvent",
+    "CommitCommentEvent",
+    "CreateEvent",
+    "DeleteEvent",
+    "ReleaseEvent",
+]
 
-def _normalize_event_names(df: pl.LazyFrame) -> pl.LazyFrame:   
+def _normalize_event_names(df: pl.LazyFrame) -> pl.LazyFrame:
     schema = df.collect_schema()
     has_pr_merged = "pr_merged" in schema
     has_review_state = "review_state" in schema
     has_create_ref_type = "create_ref_type" in schema
     has_delete_ref_type = "delete_ref_type" in schema
 
-    return df.with_columns(
-        pl.when(pl.col("activity") == "PullRequestEvent")
-        .then(
-            pl.when((pl.col("action") == "closed") & (pl.col("pr_merged") == True) if has_pr_merged else False)
-            .then(pl.lit("PullRequestEvent_merged"))
-            .when((pl.col("action") == "closed") & (pl.col("pr_merged") == False) if has_pr_merged else False)
-            .then(pl.lit("PullRequestEvent_rejected"))
-            .otherwise(pl.col("activity").cast(pl.Utf8) + "_" + pl.col("action").cast(pl.Utf8))
-        )
-        .when(pl.col("activity") == "IssuesEvent")
-        .then(pl.col("activity").cast(pl.Utf8) + "_" + pl.col("action").cast(pl.Utf8))
-        .when(pl.col("activity") == "PullRequestReviewEvent")
-        .then(
-            pl.col("activity").cast(pl.Utf8) + "_" +
-            (pl.col("review_state").cast(pl.Utf8) if has_review_state else pl.col("action").cast(pl.Utf8))
-        )
-        
-        
-        .when(pl.col("activity").is_in([
-            "IssueCommentEvent", 
-            "PullRequestReviewCommentEvent", 
-            "CommitCommentEvent"  
-        ]))
-        .then(pl.col("activity").cast(pl.Utf8) + "_" + pl.col("action").cast(pl.Utf8))
-        
+    activity = pl.col("activity").cast(pl.Utf8)
+    action = pl.col("action").cast(pl.Utf8)
+    is_closed_pr = (pl.col("activity") == "PullRequestEvent") & (pl.col("action") == "closed")
 
+    # Il nome normalizzato è sempre "<activity>_<suffisso>": si calcola solo il
+    # suffisso (di default l'action) e si concatena una volta sola.
+    suffix = (
+        pl.when(is_closed_pr & (pl.col("pr_merged") == True) if has_pr_merged else False)
+        .then(pl.lit("merged"))
+        .when(is_closed_pr & (pl.col("pr_merged") == False) if has_pr_merged else False)
+        .then(pl.lit("rejected"))
+        .when(pl.col("activity") == "PullRequestReviewEvent")
+        .then(pl.col("review_state").cast(pl.Utf8) if has_review_state else action)
         .when(pl.col("activity") == "CreateEvent")
-        .then(
-            pl.col("activity").cast(pl.Utf8) + "_" +
-            (pl.col("create_ref_type").cast(pl.Utf8) if has_create_ref_type else pl.lit("ref"))
-        )
+        .then(pl.col("create_ref_type").cast(pl.Utf8) if has_create_ref_type else pl.lit("ref"))
         .when(pl.col("activity") == "DeleteEvent")
-        .then(
-            pl.col("activity").cast(pl.Utf8) + "_" +
-            (pl.col("delete_ref_type").cast(pl.Utf8) if has_delete_ref_type else pl.lit("ref"))
-        )
-        .when(pl.col("activity") == "ReleaseEvent")
-        .then(pl.col("activity").cast(pl.Utf8) + "_" + pl.col("action").cast(pl.Utf8))
-        .otherwise(pl.col("activity").cast(pl.Utf8))
+        .then(pl.col("delete_ref_type").cast(pl.Utf8) if has_delete_ref_type else pl.lit("ref"))
+        .otherwise(action)
+    )
+
+    return df.with_columns(
+        pl.when(pl.col("activity").is_in(_ACTIVITIES_WITH_SUFFIX))
+        .then(activity + "_" + suffix)
+        .otherwise(activity)
         .alias("concept:name")
-    )
\ No newline at end of file
+    )
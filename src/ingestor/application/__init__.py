@@ -1,11 +1,13 @@
 from .use_cases import IngestionService
 from .interfaces import IIngestionUseCase
-from .errors import IngestionError, DataSourceError, InvalidInputError
+from .errors import IngestionError, DataSourceError, ArchiveNotFoundError, EventStorageError, InvalidInputError
 
 __all__ = [
     "IngestionService",
     "IIngestionUseCase",
     "IngestionError",
     "DataSourceError",
+    "ArchiveNotFoundError",
+    "EventStorageError",
     "InvalidInputError",
 ]
\ No newline at end of file
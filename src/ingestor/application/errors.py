@@ -4,5 +4,11 @@ class IngestionError(Exception):
 class DataSourceError(IngestionError):
     pass
 
+class ArchiveNotFoundError(DataSourceError):
+    pass
+
+class EventStorageError(IngestionError):
+    pass
+
 class InvalidInputError(IngestionError, ValueError):
     pass
\ No newline at end of file
@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, date
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
+from ..domain.entities import DailyIndex
 from ..domain.types import IngestionHourStatus
 
 class IIngestionUseCase(ABC):
     @abstractmethod
-    def process_single_hour(self, hour_timestamp: str, force_reprocessing: bool = False) -> Tuple[IngestionHourStatus, int, int, int]:
+    def process_single_hour(
+        self,
+        hour_timestamp: str,
+        force_reprocessing: bool = False,
+        daily_index: Optional[DailyIndex] = None
+    ) -> Tuple[IngestionHourStatus, int, int, int]:
         pass
 
     @abstractmethod
@@ -1,31 +1,57 @@
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, date
+from functools import partial
 import os
-from typing import Tuple, Dict, Any, Optional, Union
+from typing import Tuple, Dict, Any, List, Optional, Union
 
 from .interfaces import IIngestionUseCase
 from ..domain.interfaces import IEventSource, IIngestionIndexRepository
+from ..domain.entities import DailyIndex
 from ..domain import services as domain_services
 from ..domain.types import IngestionHourStatus
-from ..application.errors import DataSourceError
+from ..application.errors import DataSourceError, ArchiveNotFoundError, EventStorageError
 
 class IngestionService(IIngestionUseCase):    
     def __init__(
         self,
         event_source: IEventSource,
         index_repo: IIngestionIndexRepository,
-        logger: Optional[Union[logging.Logger, logging.LoggerAdapter]] = None
+        logger: Optional[Union[logging.Logger, logging.LoggerAdapter]] = None,
+        max_workers: int = 1
     ):
         self.source = event_source
         self.index_repo = index_repo
         self.logger = logger or logging.getLogger(__name__)
+        self.max_workers = max(1, max_workers)
+        # Le ore dello stesso giorno condividono l'indice giornaliero: lettura,
+        # aggiornamento e salvataggio devono avvenire in modo atomico.
+        self._index_lock = threading.Lock()
 
-    def process_single_hour(self, hour_timestamp: str, force_reprocessing: bool = False) -> Tuple[IngestionHourStatus, int, int, int]:
-        hour_dt = datetime.strptime(hour_timestamp, "%Y-%m-%d-%H")
-        current_day = hour_dt.date()
+    def process_single_hour(
+        self,
+        hour_timestamp: str,
+        force_reprocessing: bool = False,
+        daily_index: Optional[DailyIndex] = None
+    ) -> Tuple[IngestionHourStatus, int, int, int]:
+        current_day = datetime.strptime(hour_timestamp, "%Y-%m-%d-%H").date()
+        return self._process_hour(current_day, hour_timestamp, force_reprocessing, daily_index)
+
+    def _process_hour(
+        self,
+        current_day: date,
+        hour_timestamp: str,
+        force_reprocessing: bool = False,
+        daily_index: Optional[DailyIndex] = None
+    ) -> Tuple[IngestionHourStatus, int, int, int]:
         archive_url = f"https://data.gharchive.org/{hour_timestamp}.json.gz"
 
-        daily_index = self.index_repo.get_by_day(current_day)
+        # Con un indice condiviso dal chiamante (un'unica istanza per giorno)
+        # non serve rileggerlo da disco né prima né dopo l'elaborazione.
+        is_shared_index = daily_index is not None
+        if daily_index is None:
+            daily_index = self.index_repo.get_by_day(current_day)
 
         if hour_timestamp in daily_index.hours_processed and not force_reprocessing:
             self.logger.info(f"Ora {hour_timestamp} già elaborata con successo. Salto.")
@@ -35,10 +61,11 @@ class IngestionService(IIngestionUseCase):
             self.logger.info(f"Ora {hour_timestamp} già marcata come 404. Salto.")
             return "SKIPPED_404", 0, 0, 0
 
-        writer = self.index_repo.get_writer_for_day(current_day)
+        writer = None
         num_parsed, num_distilled, num_discarded = 0, 0, 0
 
         try:
+            writer = self.index_repo.get_writer_for_day(current_day)
             for raw_event in self.source.iter_events(archive_url):
                 num_parsed += 1
                 distilled_event = domain_services.extract_event_payload(raw_event)
@@ -51,11 +78,14 @@ class IngestionService(IIngestionUseCase):
                 num_distilled += 1
 
             writer.close_ok()
-            daily_index.mark_hour(
-                hour_timestamp,
-                {"total": num_parsed, "distilled": num_distilled, "bad": num_discarded},
-            )
-            self.index_repo.save(daily_index, current_day)
+            with self._index_lock:
+                if not is_shared_index:
+                    daily_index = self.index_repo.get_by_day(current_day)
+                daily_index.mark_hour(
+                    hour_timestamp,
+                    {"total": num_parsed, "distilled": num_distilled, "bad": num_discarded},
+                )
+                self.index_repo.save(daily_index, current_day)
             self.logger.info(
                 f"Ora {hour_timestamp} completata: total={num_parsed}, "
                 f"distilled={num_distilled}, bad={num_discarded}"
@@ -63,48 +93,81 @@ class IngestionService(IIngestionUseCase):
             return "SUCCESS", num_parsed, num_distilled, num_discarded
 
         except DataSourceError as error:
-            writer.close_abort()
-            is_404 = '404' in str(error.__cause__) if error.__cause__ else False
-
-            if is_404:
+            if writer is not None:
+                writer.close_abort()
+            if isinstance(error, ArchiveNotFoundError):
                 self.logger.warning(f"Archivio per l'ora {hour_timestamp} non trovato (404).")
-                daily_index.mark_hour_not_found(hour_timestamp)
-                self.index_repo.save(daily_index, current_day)
+                with self._index_lock:
+                    if not is_shared_index:
+                        daily_index = self.index_repo.get_by_day(current_day)
+                    daily_index.mark_hour_not_found(hour_timestamp)
+                    self.index_repo.save(daily_index, current_day)
                 return "FAILED_404", 0, 0, 0
             else:
                 self.logger.error(f"Errore di rete/sorgente dati per l'ora {hour_timestamp}: {error}")
                 return "FAILED_OTHER", num_parsed, num_distilled, num_discarded
+
+        except EventStorageError as error:
+            # Eventi persi in scrittura: l'ora non va segnata come elaborata,
+            # così verrà riscaricata alla prossima esecuzione.
+            if writer is not None:
+                writer.close_abort()
+            self.logger.error(f"Errore di scrittura degli eventi per l'ora {hour_timestamp}: {error}")
+            return "FAILED_OTHER", num_parsed, num_distilled, num_discarded
             
     def process_time_range(self, start_datetime: datetime, end_datetime: datetime, force_reprocess: bool = False) -> Tuple[int, int, int]:
+        # Il giorno è già noto qui: le ore passano direttamente a _process_hour
+        # senza riformattare e rianalizzare il timestamp con strptime.
+        hours_by_day: Dict[date, List[str]] = {}
         current_time = start_datetime
-        total_parsed, total_distilled, total_discarded = 0, 0, 0
-        previous_day = None
-
         while current_time <= end_datetime:
-            current_day = current_time.date()
-            if previous_day and current_day != previous_day:
-                self._convert_day_if_complete(previous_day)
-
-            hour_stamp = f"{current_time.strftime('%Y-%m-%d')}-{current_time.hour}"
-
-            _status, parsed, distilled, discarded = self.process_single_hour(
-                hour_timestamp=hour_stamp, force_reprocessing=force_reprocess
-            )
+            hour_stamp = f"{current_time.year:04d}-{current_time.month:02d}-{current_time.day:02d}-{current_time.hour}"
+            hours_by_day.setdefault(current_time.date(), []).append(hour_stamp)
+            current_time += timedelta(hours=1)
 
-            total_parsed += parsed
-            total_distilled += distilled
-            total_discarded += discarded
+        total_parsed, total_distilled, total_discarded = 0, 0, 0
 
-            previous_day = current_day
-            current_time += timedelta(hours=1)
+        # Le ore sono archivi indipendenti e vengono scaricate in parallelo,
+        # un giorno alla volta: il consolidamento parte solo quando tutte le
+        # ore del giorno sono terminate, e gira in background mentre si
+        # scarica il giorno successivo.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="consolidation") as conversion_pool:
+            pending_conversions: Dict[date, Future] = {}
+            try:
+                for current_day, hour_stamps in hours_by_day.items():
+                    daily_index = self.index_repo.get_by_day(current_day)
+                    process_hour = partial(
+                        self._process_hour,
+                        current_day,
+                        force_reprocessing=force_reprocess,
+                        daily_index=daily_index,
+                    )
+                    results = executor.map(process_hour, hour_stamps)
+
+                    for _status, parsed, distilled, discarded in results:
+                        total_parsed += parsed
+                        total_distilled += distilled
+                        total_discarded += discarded
+
+                    pending_conversions[current_day] = conversion_pool.submit(
+                        self._convert_day_if_complete, current_day, daily_index=daily_index
+                    )
+            finally:
+                # Ogni consolidamento viene atteso e i fallimenti registrati per
+                # giorno, come in finalize_daily_indexes: un giorno fallito non
+                # interrompe il download né nasconde gli errori degli altri.
+                for day_to_convert, conversion in pending_conversions.items():
+                    try:
+                        conversion.result()
+                    except Exception as e:
+                        self.logger.warning(f"Consolidamento storage saltato per {day_to_convert}: {e}")
 
-        if previous_day:
-            self._convert_day_if_complete(previous_day)
-            
         return total_parsed, total_distilled, total_discarded
         
-    def _convert_day_if_complete(self, day_to_convert: date):
-        daily_index = self.index_repo.get_by_day(day_to_convert)
+    def _convert_day_if_complete(self, day_to_convert: date, daily_index: Optional[DailyIndex] = None):
+        if daily_index is None:
+            daily_index = self.index_repo.get_by_day(day_to_convert)
         processed_count = len(daily_index.hours_processed)
         not_found_count = len(daily_index.hours_not_found)
         day_string = day_to_convert.strftime('%Y-%m-%d')
@@ -13,6 +13,8 @@ class DistilledEvent:
     actor_login: str | None = None
 
 class DailyIndex:
+    __slots__ = ("data", "hours_processed", "hours_not_found", "_dirty")
+
     def __init__(self, data: Dict[str, Any]):
         self.data = data
         self.data.setdefault("hours_processed", {})
@@ -21,24 +23,40 @@ class DailyIndex:
         
         self.hours_processed: Set[str] = set(self.data.get("hours_processed", {}).keys())
         self.hours_not_found: Set[str] = set(self.data.get("hours_not_found", []))
+        # Diventa True solo quando un mutatore cambia lo stato rispetto al caricamento.
+        self._dirty = False
 
     def mark_hour(self, hour_stamp: str, stats: Dict[str, int]) -> None:
         self.hours_processed.add(hour_stamp)
         self.data["hours_processed"][hour_stamp] = stats
 
-        if hour_stamp in self.hours_not_found:
-            self.hours_not_found.remove(hour_stamp)
-            self.data["hours_not_found"] = sorted(list(self.hours_not_found))
+        self.hours_not_found.discard(hour_stamp)
+        self._dirty = True
 
     def mark_hour_not_found(self, hour_stamp: str) -> None:
         """Segna un'ora come non trovata (404)."""
         if hour_stamp not in self.hours_not_found:
             self.hours_not_found.add(hour_stamp)
-            self.data["hours_not_found"].append(hour_stamp)
-            self.data["hours_not_found"] = sorted(list(self.hours_not_found))
+            self._dirty = True
+
+    @property
+    def is_dirty(self) -> bool:
+        """True se l'indice è stato modificato dall'ultimo salvataggio."""
+        return self._dirty
+
+    def mark_clean(self) -> None:
+        self._dirty = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Restituisce i dati da serializzare; la lista dei 404 viene ordinata solo qui."""
+        self.data["hours_not_found"] = sorted(self.hours_not_found)
+        return self.data
 
     def add_counts(self, new_counts: Dict[str, int]) -> None:
-        daily_counts = self.data.get("daily_counts", {})
+        # "daily_counts" esiste sempre (setdefault in __init__): si aggiorna sul posto.
+        daily_counts = self.data["daily_counts"]
+        get_count = daily_counts.get
         for key, value in new_counts.items():
-            daily_counts[key] = daily_counts.get(key, 0) + value
-        self.data["daily_counts"] = daily_counts
\ No newline at end of file
+            daily_counts[key] = get_count(key, 0) + value
+        if new_counts:
+            self._dirty = True
\ No newline at end of file
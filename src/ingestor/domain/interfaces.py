@@ -8,6 +8,10 @@ class IEventSource(ABC):
     def iter_events(self, url: str) -> Iterator[Dict[str, Any]]:
         pass
 
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
 class IEventWriter(ABC):
     @abstractmethod
     def write_event(self, event: DistilledEvent) -> None:
@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from .entities import DistilledEvent
 
 _PAYLOAD_TYPE_MAP: Dict[str, str] = {
@@ -14,10 +15,14 @@ _PAYLOAD_TYPE_MAP: Dict[str, str] = {
     "WorkflowRunEvent": "WorkflowRun",
 }
 
+# Sostituto condiviso e immutabile per actor/repo mancanti: evita di allocare
+# due dict vuoti per ogni evento.
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
 def extract_event_payload(raw_event: Dict[str, Any]) -> Optional[DistilledEvent]:
     event_type = raw_event.get("type")
-    actor = raw_event.get("actor", {}) or {}
-    repo = raw_event.get("repo", {}) or {}
+    actor = raw_event.get("actor") or _EMPTY
+    repo = raw_event.get("repo") or _EMPTY
     created_at = raw_event.get("created_at")
     actor_id = actor.get("id")
     repo_name = repo.get("name")
@@ -31,7 +36,7 @@ def extract_event_payload(raw_event: Dict[str, Any]) -> Optional[DistilledEvent]
         timestamp=created_at,
         actor_id=actor_id,
         repo_name=repo_name,
-        payload_type=_PAYLOAD_TYPE_MAP.get(str(event_type)),
+        payload_type=_PAYLOAD_TYPE_MAP.get(event_type) if isinstance(event_type, str) else None,
         repo_id=repo.get("id"),          
         actor_login=actor.get("login"),  
     )
\ No newline at end of file
@@ -1,22 +1,23 @@
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
-def parse_hour(hour_string: str) -> Optional[datetime]:
-    if not re.match(r"^\d{4}-\d{2}-\d{2}-\d{1,2}$", hour_string):
-        return None
+# L'ora non ammette zero padding (es. "2024-01-01-1", non "2024-01-01-01").
+_HOUR_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})-(\d|[1-9]\d)")
 
-    parts = hour_string.split('-')
-    hour_part = parts[-1]
-    if len(hour_part) == 2 and hour_part.startswith('0'):
+@lru_cache(maxsize=65536)
+def parse_hour(hour_string: str) -> Optional[datetime]:
+    match = _HOUR_PATTERN.fullmatch(hour_string)
+    if not match:
         return None
 
     try:
-        parsed = datetime.strptime(hour_string, "%Y-%m-%d-%H")
+        parsed = datetime(*map(int, match.groups()))
     except ValueError:
         return None
 
     if parsed.year < 2000 or parsed.year > 2100:
         return None
 
-    return parsed
\ No newline at end of file
+    return parsed
@@ -1,54 +1,125 @@
 import os
-import json
+import threading
+import orjson
 import polars as pl
-from typing import IO
+from typing import IO, List, Optional
 from ..domain.interfaces import IEventWriter
 from ..domain.entities import DistilledEvent
+from .logging_config import get_layer_logger
+from ..application.errors import EventStorageError
 from .fs_utils import Paths
 
+_FLUSH_THRESHOLD_BYTES = 1024 * 1024
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
 class DailyEventFileWriter(IEventWriter):
-    def __init__(self, paths: Paths):
+    def __init__(self, paths: Paths, sync_every: int = 0):
         self.paths = paths
+        self.logger = get_layer_logger(self.__class__.__name__, "Infrastructure")
+        # Group commit: con sync_every > 0 i dati vengono forzati su disco
+        # ogni sync_every flush (e alla chiusura) invece che mai esplicitamente.
+        self.sync_every = max(0, sync_every)
+        self._unsynced_flushes = 0
         self._file: IO | None = None
+        # Più ore dello stesso giorno possono scrivere in parallelo sullo stesso file.
+        self._lock = threading.Lock()
+        # Le linee serializzate si accumulano qui e vengono scritte con
+        # un'unica write quando il buffer supera la soglia o alla chiusura.
+        self._buffer: List[bytes] = []
+        self._buffer_bytes = 0
+        # Dopo una scrittura fallita il buffer (anche di altre ore) è perso e il
+        # file può contenere una riga troncata: il writer non conferma più nulla.
+        self._write_error: Optional[EventStorageError] = None
+        # Percorso e directory sono fissi per tutta la vita del writer: si
+        # risolvono e si creano una sola volta.
+        self.paths.ensure_day_dir()
+        self._events_path = self.paths.events_path
         self._open_file()
 
     def _open_file(self):
-        dir_path = os.path.dirname(self.paths.events_path)
-        os.makedirs(dir_path, exist_ok=True)
-
         if self._file is None or self._file.closed:
             try:
-                self._file = open(self.paths.events_path, "a", encoding="utf-8")
-            except Exception as e:
-                (f"[ERROR] Impossibile aprire {self.paths.events_path}: {e}")
+                self._file = open(self._events_path, "ab")
+            except OSError as e:
                 self._file = None
+                raise EventStorageError(f"Impossibile aprire {self._events_path}: {e}") from e
 
     def write_event(self, event: DistilledEvent) -> None:
-        self._open_file()
-        if not self._file or self._file.closed:
+        try:
+            # orjson serializza il dataclass direttamente in bytes UTF-8.
+            line = orjson.dumps(event, default=str) + b"\n"
+        except orjson.JSONEncodeError as e:
+            self.logger.warning(f"Evento {event.case_id} non serializzabile, scartato: {e}")
+            return
+
+        with self._lock:
+            if self._write_error:
+                raise self._write_error
+            self._buffer.append(line)
+            self._buffer_bytes += len(line)
+            if self._buffer_bytes >= _FLUSH_THRESHOLD_BYTES:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
             return
 
         try:
-            safe_event = json.dumps(event.__dict__, default=str, ensure_ascii=False)
-            self._file.write(safe_event + "\n")
-        except Exception as e:
-            (f"[ERROR] Scrittura evento fallita: {e}")
+            self._open_file()
+            self._file.write(b"".join(self._buffer))
+            self._unsynced_flushes += 1
+            if self.sync_every and self._unsynced_flushes >= self.sync_every:
+                self._sync()
+        except (OSError, EventStorageError) as e:
+            self.logger.error(f"Scrittura eventi fallita su {self._events_path}: {e}")
+            self._write_error = EventStorageError(f"Scrittura eventi fallita su {self._events_path}: {e}")
+            raise self._write_error from e
+        finally:
+            self._buffer.clear()
+            self._buffer_bytes = 0
+
+    def _sync(self) -> None:
+        self._file.flush()
+        _fdatasync(self._file.fileno())
+        self._unsynced_flushes = 0
 
     def close_ok(self) -> None:
-        if self._file and not self._file.closed:
-            self._file.close()
+        with self._lock:
+            try:
+                if self._write_error:
+                    raise self._write_error
+                self._flush()
+                if self._file and not self._file.closed and self.sync_every and self._unsynced_flushes:
+                    self._sync()
+            except OSError as e:
+                self._write_error = EventStorageError(f"Sincronizzazione fallita su {self._events_path}: {e}")
+                raise self._write_error from e
+            finally:
+                if self._file and not self._file.closed:
+                    try:
+                        self._file.close()
+                    except OSError as e:
+                        self._write_error = EventStorageError(f"Chiusura fallita su {self._events_path}: {e}")
+                        raise self._write_error from e
 
     def close_abort(self) -> None:
-        self.close_ok()
+        try:
+            self.close_ok()
+        except EventStorageError:
+            # L'ora è già fallita: l'errore di scrittura è registrato e loggato.
+            pass
 
     def consolidate_storage(self) -> None:
-            if self._file and not self._file.closed:
-                self._file.close()
+            self.close_ok()
                 
-            source_path = self.paths.events_path
+            source_path = self._events_path
             target_dir = self.paths.parquet_dir
 
-            if not os.path.exists(source_path) or os.path.getsize(source_path) == 0:
+            try:
+                source_size = os.stat(source_path).st_size
+            except FileNotFoundError:
+                return
+            if source_size == 0:
                 return
 
             try:
@@ -60,4 +131,4 @@ class DailyEventFileWriter(IEventWriter):
 
                 os.remove(source_path)
             except Exception as e:
-                (f"[ERROR] Consolidamento streaming fallito per {source_path}: {e}")
\ No newline at end of file
+                self.logger.error(f"Consolidamento streaming fallito per {source_path}: {e}")
\ No newline at end of file
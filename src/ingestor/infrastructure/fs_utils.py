@@ -1,8 +1,8 @@
 import os
-import json
+import orjson
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from ..domain.utils import parse_hour
 
 @dataclass
@@ -12,7 +12,10 @@ class Paths:
 
     @property
     def day_dir(self) -> str:
-        dir_path = os.path.join(self.base_dir, self.day.strftime('%Y/%m/%d'))
+        return os.path.join(self.base_dir, self.day.strftime('%Y/%m/%d'))
+
+    def ensure_day_dir(self) -> str:
+        dir_path = self.day_dir
         os.makedirs(dir_path, exist_ok=True)
         return dir_path
 
@@ -37,51 +40,63 @@ def folder_size_mb(path: str) -> float:
     total_bytes = 0
     if not os.path.exists(path):
         return 0.0
-    for root, _, files in os.walk(path):
-        for filename in files:
-            try:
-                total_bytes += os.path.getsize(os.path.join(root, filename))
-            except OSError:
-                pass
+
+    # scandir espone tipo e stat della entry: una sola syscall per file.
+    pending_dirs = [path]
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        try:
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        else:
+                            total_bytes += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
     return total_bytes / (1024 * 1024)
 
+def _iter_day_dirs(base_dir: str) -> Iterator[str]:
+    """Restituisce le directory giornaliere base_dir/YYYY/MM/DD."""
+    for year in _subdirs(base_dir):
+        for month in _subdirs(year):
+            yield from _subdirs(month)
+
+def _subdirs(path: str) -> List[str]:
+    try:
+        with os.scandir(path) as entries:
+            return [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+
 def get_dataset_summary(base_dir: str) -> Optional[Tuple[str, str, int, int, float]]:
-    min_hour = max_hour = None
     found_hours: set[str] = set()
 
     if not os.path.isdir(base_dir):
         return None
 
-    for root, _, files in os.walk(base_dir):
-        if "index.json" in files:
-            try:
-                with open(os.path.join(root, "index.json"), "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    hours = data.get("hours_processed", {})
-                    if hours:
-                        found_hours.update(hours.keys())
-            except Exception:
-                continue
-
-    if not found_hours:
-        return None
+    for day_dir in _iter_day_dirs(base_dir):
+        try:
+            with open(os.path.join(day_dir, "index.json"), "rb") as f:
+                data = orjson.loads(f.read())
+            hours = data.get("hours_processed", {})
+            if hours:
+                found_hours.update(hours.keys())
+        except Exception:
+            continue
 
-    valid_dts = []
-    for h in found_hours:
-        dt = parse_hour(h)
-        if dt:
-            valid_dts.append(dt)
-            
+    # Ogni ora viene analizzata una sola volta; min e max derivano dallo
+    # stesso insieme, quindi tutte le ore valide ricadono nel range.
+    valid_dts = [dt for dt in map(parse_hour, found_hours) if dt]
     if not valid_dts:
         return None
 
     min_dt, max_dt = min(valid_dts), max(valid_dts)
     total_possible_hours = int((max_dt - min_dt).total_seconds() // 3600) + 1
-    
-    count_in_range = 0
-    for dt in valid_dts:
-        if min_dt <= dt <= max_dt:
-            count_in_range += 1
+    count_in_range = len(valid_dts)
 
     processed_pct = (count_in_range / total_possible_hours * 100) if total_possible_hours > 0 else 0.0
 
@@ -91,4 +106,4 @@ def get_dataset_summary(base_dir: str) -> Optional[Tuple[str, str, int, int, flo
         count_in_range,
         total_possible_hours,
         processed_pct
-    )
\ No newline at end of file
+    )
@@ -1,42 +1,125 @@
-import logging
+import json
 import time
+from typing import Any, Dict, Iterator
+
+import orjson
 import requests
-import gzip
-import json
-from typing import Iterator, Dict, Any
-from requests.exceptions import Timeout, ConnectionError as ConnErr, RequestException, HTTPError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+
+try:
+    # ISA-L decomprime lo stesso formato gzip molto più velocemente di zlib.
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
 
+from ..application.errors import ArchiveNotFoundError, DataSourceError
 from ..domain.interfaces import IEventSource
-from ..application.errors import DataSourceError
+from .logging_config import get_layer_logger
+
+_READ_CHUNK_SIZE = 4 * 1024 * 1024
 
 class GhArchiveEventSource(IEventSource):
     
-    def __init__(self, timeout: int = 60, max_retries: int = 3, backoff_base: float = 1.5):
+    def __init__(
+        self,
+        timeout: int = 60,
+        max_retries: int = 3,
+        backoff_base: float = 1.5,
+        pool_size: int = 4,
+        read_chunk_size: int = _READ_CHUNK_SIZE
+    ):
         self.timeout = timeout
-        self.max_retries = max_retries
+        self.read_chunk_size = read_chunk_size
+        self.max_retries = max(1, max_retries)
         self.backoff_base = backoff_base
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self.logger = get_layer_logger(self.__class__.__name__, "Infrastructure")
+        # Sessione condivisa: le connessioni keep-alive evitano un handshake
+        # TCP+TLS per ogni ora. I tentativi di connessione e le risposte 5xx
+        # sono ritentati solo da urllib3; il pool è dimensionato sul numero
+        # di ore scaricate in parallelo, altrimenti le connessioni in eccesso
+        # verrebbero scartate.
+        retry = Retry(
+            total=self.max_retries - 1,
+            backoff_factor=backoff_base,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _open_archive(self, url: str) -> requests.Response:
+        try:
+            response = self.session.get(url, stream=True, timeout=self.timeout)
+        except RequestException as error:
+            raise DataSourceError(f"Impossibile scaricare {url}") from error
 
-    def _iter_lines(self, url: str) -> Iterator[str]:
+        if response.status_code == 404:
+            # Un archivio mancante non ricompare ritentando: nessun retry.
+            response.close()
+            raise ArchiveNotFoundError(f"Archivio non trovato: {url}")
+        try:
+            response.raise_for_status()
+        except HTTPError as error:
+            response.close()
+            raise DataSourceError(f"Impossibile scaricare {url}") from error
+        return response
+
+    def _iter_lines(self, url: str) -> Iterator[bytes]:
+        # Questo ciclo copre solo le interruzioni durante lo streaming del
+        # corpo, che urllib3 non può ritentare: l'archivio viene riaperto e le
+        # linee già restituite al chiamante vengono saltate, così nessun
+        # evento viene scritto due volte.
+        lines_yielded = 0
         for attempt in range(self.max_retries):
+            response = self._open_archive(url)
+            lines_to_skip = lines_yielded
             try:
-                response = requests.get(url, stream=True, timeout=self.timeout)
-                response.raise_for_status()
                 with gzip.GzipFile(fileobj=response.raw, mode="rb") as gz_file:
-                    for line in gz_file:
-                        yield line.decode("utf-8")
+                    # Lettura a blocchi e split in C invece di readline riga per riga;
+                    # le linee restano bytes perché orjson le decodifica direttamente.
+                    carry = b""
+                    while chunk := gz_file.read(self.read_chunk_size):
+                        lines = (carry + chunk).split(b"\n")
+                        carry = lines.pop()
+                        if lines_to_skip:
+                            skipped = min(lines_to_skip, len(lines))
+                            lines_to_skip -= skipped
+                            lines = lines[skipped:]
+                        lines_yielded += len(lines)
+                        yield from lines
+                    if carry and not lines_to_skip:
+                        lines_yielded += 1
+                        yield carry
                 return
-            except (Timeout, ConnErr, RequestException, HTTPError) as error:
+            except (Urllib3HTTPError, RequestException, EOFError) as error:
                 self.logger.warning(f"Tentativo {attempt + 1}/{self.max_retries} fallito per {url}. Causa: {error}")
                 if attempt < self.max_retries - 1:
                     time.sleep(self.backoff_base ** (attempt + 1))
                 else:
                     raise DataSourceError(f"Impossibile scaricare {url}") from error
+            finally:
+                response.close()
+
+    def close(self) -> None:
+        """Chiude la sessione HTTP e le connessioni keep-alive del pool."""
+        self.session.close()
 
     def iter_events(self, url: str) -> Iterator[Dict[str, Any]]:
         for line in self._iter_lines(url):
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                self.logger.debug(f"Saltata linea malformata in {url}")
-                continue
\ No newline at end of file
+                event = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # orjson rifiuta i surrogati isolati (es. "\ud83d") che GH Archive
+                # contiene nei testi liberi: json li accetta, quindi si ritenta.
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    self.logger.debug(f"Saltata linea malformata in {url}")
+                    continue
+            yield event
\ No newline at end of file
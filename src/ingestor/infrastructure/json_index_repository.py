@@ -1,7 +1,8 @@
 import os
-import json
+import threading
+import orjson
 from datetime import date
-from typing import Dict, Any
+from typing import Dict, Any, Set
 
 from ..domain.entities import DailyIndex
 from ..domain.interfaces import IIngestionIndexRepository, IEventWriter
@@ -9,36 +10,60 @@ from .file_writer import DailyEventFileWriter
 from .fs_utils import Paths, folder_size_mb, get_dataset_summary
 
 class JsonIngestionIndexRepository(IIngestionIndexRepository):
-    def __init__(self, base_output_dir: str):
+    def __init__(self, base_output_dir: str, sync_every: int = 0):
         self.base_dir = base_output_dir
+        self.sync_every = sync_every
         self._writers_cache: Dict[date, IEventWriter] = {}
+        self._writers_lock = threading.Lock()
+        # Paths e directory già create vengono riusati per tutte le ore del giorno.
+        self._paths_cache: Dict[date, Paths] = {}
+        self._ready_day_dirs: Set[date] = set()
 
     def _get_paths(self, day: date) -> Paths:
-        return Paths(base_dir=self.base_dir, day=day)
+        paths = self._paths_cache.get(day)
+        if paths is None:
+            paths = Paths(base_dir=self.base_dir, day=day)
+            self._paths_cache[day] = paths
+        return paths
 
     def get_by_day(self, day: date) -> DailyIndex:
         index_path = self._get_paths(day).index_path
-        if not os.path.exists(index_path):
-            return DailyIndex(data={})
-        
+        # Nessun os.path.exists preventivo: un indice mancante è già gestito
+        # da FileNotFoundError con una syscall in meno.
         try:
-            with open(index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(index_path, "rb") as f:
+                data = orjson.loads(f.read())
             return DailyIndex(data=data)
-        except (json.JSONDecodeError, FileNotFoundError):
+        except (orjson.JSONDecodeError, FileNotFoundError):
             return DailyIndex(data={})
 
     def save(self, index: DailyIndex, day: date) -> None:
+        # Un indice invariato dall'ultimo caricamento/salvataggio non va riscritto.
+        if not index.is_dirty:
+            return
         paths = self._get_paths(day)
-        os.makedirs(paths.day_dir, exist_ok=True)
-        with open(paths.index_path, "w", encoding="utf-8") as f:
-            json.dump(index.data, f, indent=4)
+        if day not in self._ready_day_dirs:
+            paths.ensure_day_dir()
+            self._ready_day_dirs.add(day)
+        # Scrittura su file temporaneo e os.replace atomico: un crash a metà
+        # salvataggio non lascia mai un index.json troncato.
+        tmp_path = paths.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(index.snapshot(), option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, paths.index_path)
+        index.mark_clean()
             
     def get_writer_for_day(self, day: date) -> IEventWriter:
-        if day not in self._writers_cache:
-            paths = self._get_paths(day)
-            self._writers_cache[day] = DailyEventFileWriter(paths)
-        return self._writers_cache[day]
+        writer = self._writers_cache.get(day)
+        if writer is not None:
+            return writer
+        with self._writers_lock:
+            writer = self._writers_cache.get(day)
+            if writer is None:
+                paths = self._get_paths(day)
+                writer = DailyEventFileWriter(paths, sync_every=self.sync_every)
+                self._writers_cache[day] = writer
+            return writer
     
     def get_parquet_path_for_day(self, day: date) -> str:
         paths = self._get_paths(day)
@@ -1,9 +1,8 @@
 import argparse
-import logging
 import sys
 from dotenv import load_dotenv
 
-from ..infrastructure.logging_config import configure_logging, LayerLoggerAdapter
+from ..infrastructure.logging_config import configure_logging, get_layer_logger
 from ..infrastructure.gharchive_source import GhArchiveEventSource
 from ..infrastructure.json_index_repository import JsonIngestionIndexRepository
 from ..application.use_cases import IngestionService
@@ -13,13 +12,16 @@ def main():
     load_dotenv()
     configure_logging()
 
-    cli_logger = LayerLoggerAdapter(logging.getLogger("CLI"), {"layer": "Presentation"})
+    cli_logger = get_layer_logger("CLI", "Presentation")
     
-    app_logger = LayerLoggerAdapter(logging.getLogger("IngestionService"), {"layer": "Application"})
+    app_logger = get_layer_logger("IngestionService", "Application")
 
+    source = None
     try:
         parser = argparse.ArgumentParser(description="Dataset Ingestor CLI")
         parser.add_argument("--config-path", help="Path dataset", default="data/dataset")
+        parser.add_argument("--workers", type=int, default=4, help="Numero di ore elaborate in parallelo")
+        parser.add_argument("--sync-every", type=int, default=0, help="Forza fdatasync ogni N flush degli eventi (0 = mai)")
         
         group = parser.add_mutually_exclusive_group(required=True)
         group.add_argument("--download", nargs=2, metavar=("START", "END"), help="Range YYYY-MM-DD-HH")
@@ -29,12 +31,12 @@ def main():
         
         args = parser.parse_args()
 
-        repo = JsonIngestionIndexRepository(args.config_path)
-        source = GhArchiveEventSource()
+        repo = JsonIngestionIndexRepository(args.config_path, sync_every=args.sync_every)
+        source = GhArchiveEventSource(pool_size=args.workers)
         
-        service = IngestionService(event_source=source, index_repo=repo, logger=app_logger)
+        service = IngestionService(event_source=source, index_repo=repo, logger=app_logger, max_workers=args.workers)
         
-        controller = DatasetController(service, cli_logger)
+        controller = DatasetController(service, cli_logger, workers=args.workers)
 
         if args.reset:
             controller.reset_dataset(args.config_path)
@@ -48,6 +50,9 @@ def main():
     except Exception as e:
         cli_logger.critical(f"Errore fatale imprevisto: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if source is not None:
+            source.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
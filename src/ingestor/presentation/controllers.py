@@ -1,15 +1,17 @@
-from datetime import timedelta, datetime
+from datetime import timedelta
 import os
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from ..application.interfaces import IIngestionUseCase
 from ..domain.utils import parse_hour
 
 class DatasetController:
-    def __init__(self, use_case: IIngestionUseCase, logger: logging.LoggerAdapter):
+    def __init__(self, use_case: IIngestionUseCase, logger: logging.LoggerAdapter, workers: int = 1):
         self.use_case = use_case
         self.logger = logger
+        self.workers = max(1, workers)
 
     def run_download(self, start_str: str, end_str: str):
         start_time = parse_hour(start_str)
@@ -30,10 +32,13 @@ class DatasetController:
     def run_hours(self, hours: List[str]):
         hours_to_process = sorted(list(set(hours)))
         valid_hours = []
+        completed_days = set()
 
         for h in hours_to_process:
-            if parse_hour(h):
+            parsed_hour = parse_hour(h)
+            if parsed_hour:
                 valid_hours.append(h)
+                completed_days.add(parsed_hour.date())
             else:
                 self.logger.warning(f"Ignorata ora non valida: {h}")
 
@@ -44,14 +49,18 @@ class DatasetController:
         self.logger.info(f"Avvio elaborazione di {len(valid_hours)} ore.")
         total_parsed, total_distilled, total_discarded = 0, 0, 0
         
-        for hour_stamp in valid_hours:
+        def process(hour_stamp: str):
             self.logger.info(f"Elaborazione ora: {hour_stamp}")
-            _, parsed, distilled, discarded = self.use_case.process_single_hour(hour_stamp)
-            total_parsed += parsed
-            total_distilled += distilled
-            total_discarded += discarded
+            return self.use_case.process_single_hour(hour_stamp)
+
+        # Le ore sono archivi indipendenti: il download avviene in parallelo,
+        # writer e indice giornaliero sono già protetti da lock nel service.
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _, parsed, distilled, discarded in executor.map(process, valid_hours):
+                total_parsed += parsed
+                total_distilled += distilled
+                total_discarded += discarded
         
-        completed_days = {datetime.strptime(h, "%Y-%m-%d-%H").date() for h in valid_hours}
         self.use_case.finalize_daily_indexes(list(completed_days))
         
         self.logger.info(f"Totale Sessione: Parsed={total_parsed}, Distilled={total_distilled}, Bad={total_discarded}")
@@ -49,4 +49,58 @@ def test_provider_load_repo_creation_events(provider_config):
     
     assert df_creation.shape[0] == 1
     assert df_creation["repo_id"][0] == 101 
-    assert "timestamp" in df_creation.columns
\ No newline at end of file
+    assert "timestamp" in df_creation.columns
+
+def test_provider_reuses_source_scan(provider_config, monkeypatch):
+    scan_calls = []
+    original_scan = pl.scan_parquet
+
+    def counting_scan(*args, **kwargs):
+        scan_calls.append(args)
+        return original_scan(*args, **kwargs)
+
+    monkeypatch.setattr(pl, "scan_parquet", counting_scan)
+
+    provider = ParquetDataProvider(
+        dataset_directory=provider_config.dataset_directory,
+        start_date=provider_config.start_date,
+        end_date=provider_config.end_date,
+        analyzable_repositories_file=provider_config.analyzable_repositories_file,
+        stratified_repositories_file=provider_config.stratified_repositories_parquet,
+        output_directory=provider_config.output_directory,
+        aggregate_model_subdirectory_name=provider_config.archetype_models_subdirectory_name,
+        archetype_process_models_directory=provider_config.archetype_process_models_directory
+    )
+
+    first_lf = provider.load_core_events()
+    second_lf = provider.load_core_events()
+    provider.load_raw_repo_creation_events()
+
+    assert first_lf is second_lf
+    assert len(scan_calls) == 1
+
+def test_provider_load_stratified_repositories_reads_only_needed_columns(provider_config, tmp_path):
+    stratified_path = tmp_path / "repositories_stratified.parquet"
+    pl.DataFrame({
+        "repo_id": [1, 2],
+        "strato_id": ["Low|Zero", "High|Low"],
+        "age_in_days": [10, 20],
+        "workload_norm": [0.5, 3.0],
+        "workload_norm_cat": ["Low", "High"],
+    }).write_parquet(stratified_path)
+
+    provider = ParquetDataProvider(
+        dataset_directory=provider_config.dataset_directory,
+        start_date=provider_config.start_date,
+        end_date=provider_config.end_date,
+        analyzable_repositories_file=provider_config.analyzable_repositories_file,
+        stratified_repositories_file=str(stratified_path),
+        output_directory=provider_config.output_directory,
+        aggregate_model_subdirectory_name=provider_config.archetype_models_subdirectory_name,
+        archetype_process_models_directory=provider_config.archetype_process_models_directory
+    )
+
+    stratified_df = provider.load_stratified_repositories()
+
+    assert set(stratified_df.columns) == {"repo_id", "strato_id", "age_in_days", "workload_norm_cat"}
+    assert stratified_df.height == 2
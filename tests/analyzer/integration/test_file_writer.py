@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from src.analyzer.application.errors import ResultWriteError
+from src.analyzer.config import AnalysisConfig
+from src.analyzer.infrastructure import file_writer
+from src.analyzer.infrastructure.file_writer import FileResultWriter
+
+
+@pytest.fixture
+def writer(tmp_path):
+    config = AnalysisConfig(
+        dataset_directory="/fake/data",
+        output_directory=str(tmp_path),
+        start_date="2023-01-01",
+        end_date="2023-01-31"
+    )
+    return FileResultWriter(config)
+
+def test_wait_for_pending_writes_collects_every_failure(writer, monkeypatch):
+    written = []
+
+    def fake_write_xes(event_log, output_path):
+        if event_log == "broken":
+            raise OSError(f"scrittura fallita: {output_path}")
+        written.append(output_path.rsplit("/", 1)[-1])
+
+    monkeypatch.setattr(file_writer.pm4py, "write_xes", fake_write_xes)
+
+    writer.save_event_log("broken", archetype_name="Giant_All")
+    writer.save_event_log("ok", archetype_name="Mid_Standard")
+    writer.save_event_log("broken", archetype_name="High_Perf_Balanced")
+
+    with pytest.raises(ResultWriteError) as excinfo:
+        writer.wait_for_pending_writes()
+
+    assert len(excinfo.value.errors) == 2
+    assert written == ["mid_standard_log.xes"]
+
+def test_save_event_log_waits_for_previous_export(writer, monkeypatch):
+    written = []
+
+    def slow_write_xes(event_log, output_path):
+        time.sleep(0.2)
+        written.append(event_log)
+
+    monkeypatch.setattr(file_writer.pm4py, "write_xes", slow_write_xes)
+
+    writer.save_event_log("first", archetype_name="Giant_All")
+    writer.save_event_log("second", archetype_name="Mid_Standard")
+
+    assert written == ["first"]
+    writer.wait_for_pending_writes()
+    assert written == ["first", "second"]
+
+def test_wait_for_pending_writes_without_pending_is_noop(writer):
+    writer.wait_for_pending_writes()
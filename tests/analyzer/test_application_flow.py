@@ -3,9 +3,11 @@ from unittest.mock import Mock, ANY, patch
 import pytest
 import polars as pl
 import logging
+import pandas as pd
 from src.ingestor.application.use_cases import IngestionService 
 from src.analyzer.application.errors import MissingDataError
 from src.analyzer.application.pipeline import AnalysisPipeline, AnalysisMode
+from src.analyzer.application.archetype_analysis_usecase import execute_discover_archetype_models
 from src.analyzer.domain.interfaces import IDataProvider, IResultWriter, IProcessAnalyzer, IModelAnalyzer
 from src.analyzer.config import AnalysisConfig
 from src.analyzer.domain.types import StratifiedRepositoriesDataset
@@ -100,4 +102,43 @@ def test_pipeline_full_fails_on_missing_repo_creation(mock_pipeline_deps, mock_c
     with pytest.raises(MissingDataError):
         pipeline.run(AnalysisMode.FULL, args=Mock())
     
-    provider.load_core_events.assert_not_called()
\ No newline at end of file
+    provider.load_core_events.assert_not_called()
+
+def test_discover_archetype_models_runs_both_discoveries(mock_pipeline_deps, mock_config, mock_logger):
+    provider, analyzer, writer, _ = mock_pipeline_deps
+    provider.load_stratified_repositories.return_value = pl.DataFrame({
+        "repo_id": [1],
+        "external_popularity_norm_cat": ["Giant"],
+        "collaboration_intensity_norm_cat": ["Giant"],
+        "workload_norm_cat": ["Giant"],
+        "community_engagement_norm_cat": ["Giant"],
+    })
+    event_log = pd.DataFrame({"case:concept:name": ["1"], "concept:name": ["PushEvent"]})
+    analyzer.prepare_log.return_value = event_log
+    analyzer.discover_heuristic_model_frequency.return_value = "frequency_model"
+    analyzer.discover_heuristic_model_performance.return_value = "performance_model"
+
+    execute_discover_archetype_models(provider, analyzer, writer, mock_config, mock_logger)
+
+    provider.build_aggregates_lazyframe.assert_called_once_with([1])
+    analyzer.discover_heuristic_model_performance.assert_called_once_with(event_log)
+    writer.save_event_log.assert_called_once_with(event_log, archetype_name="Giant_All")
+    writer.save_model_as_pickle.assert_any_call("frequency_model", archetype_name="Giant_All", model_type="frequency")
+    writer.save_model_as_pickle.assert_any_call("performance_model", archetype_name="Giant_All", model_type="performance")
+    writer.wait_for_pending_writes.assert_called_once()
+
+def test_discover_archetype_models_waits_for_writes_on_failure(mock_pipeline_deps, mock_config, mock_logger):
+    provider, analyzer, writer, _ = mock_pipeline_deps
+    provider.load_stratified_repositories.return_value = pl.DataFrame({
+        "repo_id": [1],
+        "external_popularity_norm_cat": ["Giant"],
+        "collaboration_intensity_norm_cat": ["Giant"],
+        "workload_norm_cat": ["Giant"],
+        "community_engagement_norm_cat": ["Giant"],
+    })
+    analyzer.prepare_log.side_effect = RuntimeError("discovery fallita")
+
+    with pytest.raises(RuntimeError):
+        execute_discover_archetype_models(provider, analyzer, writer, mock_config, mock_logger)
+
+    writer.wait_for_pending_writes.assert_called_once()
@@ -133,4 +133,35 @@ def test_build_summary_metrics_collaboration(core_events_lf):
     metrics_df = metrics_lf.collect()
        
     assert metrics_df.filter(pl.col("repo_id") == 10)["collaboration_intensity_cum"][0] == 1
-    assert metrics_df.filter(pl.col("repo_id") == 20)["collaboration_intensity_cum"][0] == 1
\ No newline at end of file
+    assert metrics_df.filter(pl.col("repo_id") == 20)["collaboration_intensity_cum"][0] == 1
+
+
+def test_build_summary_metrics_collaboration_defaults_to_zero(core_events_lf):
+    lookup = pl.DataFrame({"repo_id": [10, 20, 30], "repo_creation_date": [datetime(2024, 1, 1, tzinfo=timezone.utc)] * 3})
+
+    metrics_df = domain_services.calculate_metrics_for_repository(
+        core_events_lf.with_columns(pl.lit(None).alias("action")),
+        lookup, predicates.is_significant_pop_event,
+        predicates.is_significant_eng_event,
+        (pl.col("activity") == "ForkEvent"),
+        analysis_end_date="2024-01-31T00:00:00Z"
+    ).collect()
+
+    assert metrics_df.filter(pl.col("repo_id") == 20)["collaboration_intensity_cum"][0] == 1
+    assert metrics_df.filter(pl.col("repo_id") == 10)["collaboration_intensity_cum"][0] == 0
+    assert metrics_df.filter(pl.col("repo_id") == 30)["collaboration_intensity_cum"][0] == 0
+
+
+def test_classify_repository_builds_strato_id_from_categories():
+    metrics_lf = pl.LazyFrame({"workload_cum": [0, 5, 500], "external_popularity_cum": [1, 0, 3]})
+    thresholds = {
+        "workload_cum": {"Q50": 1.0, "Q90": 10.0, "Q99": 100.0},
+        "external_popularity_cum": {"Q50": 1.0, "Q90": 2.0, "Q99": 5.0},
+    }
+
+    result_df = domain_services.classify_repository(
+        metrics_lf, thresholds, ["Low", "Medium", "High", "Giant"]
+    ).collect()
+
+    assert result_df["workload_cum_cat"].to_list() == ["Zero", "Medium", "Giant"]
+    assert result_df["strato_id"].to_list() == ["Zero|Low", "Medium|Zero", "Giant|High"]
@@ -1,8 +1,8 @@
 import pytest
 from unittest.mock import Mock, ANY
-from datetime import date
+from datetime import date, datetime
 from src.ingestor.application.use_cases import IngestionService
-from src.ingestor.application.errors import DataSourceError
+from src.ingestor.application.errors import DataSourceError, ArchiveNotFoundError, EventStorageError
 from src.ingestor.domain.entities import DailyIndex
 
 @pytest.fixture
@@ -60,6 +60,21 @@ class TestIngestionService:
         writer.close_abort.assert_called_once()
         repo.save.assert_not_called() 
 
+    def test_process_hour_fail_storage_error(self, mock_deps):
+        """Eventi persi in scrittura: l'ora fallisce e non viene segnata come elaborata."""
+        source, repo, writer = mock_deps
+        service = IngestionService(source, repo)
+        source.iter_events.return_value = iter([
+            {"type": "PushEvent", "actor": {"id":1}, "repo": {"name":"a"}, "created_at": "d"}
+        ])
+        writer.close_ok.side_effect = EventStorageError("disk full")
+
+        status, _, _, _ = service.process_single_hour("2024-01-01-10")
+
+        assert status == "FAILED_OTHER"
+        writer.close_abort.assert_called_once()
+        repo.save.assert_not_called()
+
     def test_process_hour_fail_404(self, mock_deps):
         """
         In caso di 404:
@@ -69,9 +84,7 @@ class TestIngestionService:
         source, repo, writer = mock_deps
         service = IngestionService(source, repo)
         
-        err = DataSourceError("Not Found")
-        err.__cause__ = Exception("404 Client Error")
-        source.iter_events.side_effect = err
+        source.iter_events.side_effect = ArchiveNotFoundError("Not Found")
 
         status, _, _, _ = service.process_single_hour("2024-01-01-10")
 
@@ -98,4 +111,45 @@ class TestIngestionService:
 
         service.finalize_daily_indexes([date(2024, 1, 1)])
         
-        writer.consolidate_storage.assert_called_once()
\ No newline at end of file
+        writer.consolidate_storage.assert_called_once()
+
+    def test_process_time_range_parallel_hours(self, mock_deps):
+        """Le ore vengono elaborate in parallelo e i totali sommati; ogni giorno è consolidato una volta."""
+        source, repo, writer = mock_deps
+        service = IngestionService(source, repo, max_workers=4)
+
+        source.iter_events.side_effect = lambda url: iter([
+            {"type": "PushEvent", "actor": {"id": 1}, "repo": {"name": "a"}, "created_at": "d"}
+        ])
+
+        totals = service.process_time_range(datetime(2024, 1, 1, 22), datetime(2024, 1, 2, 1))
+
+        assert totals == (4, 4, 0)
+        assert source.iter_events.call_count == 4
+        assert repo.get_by_day.call_count == 2
+        assert repo.save.call_count == 4
+        assert [c.args[0] for c in repo.get_parquet_path_for_day.call_args_list] == [
+            date(2024, 1, 1), date(2024, 1, 2)
+        ]
+        writer.consolidate_storage.assert_not_called()
+
+    def test_process_time_range_logs_each_failed_conversion(self, mock_deps):
+        """Un consolidamento fallito viene loggato per giorno senza fermare gli altri."""
+        source, repo, _ = mock_deps
+        logger = Mock()
+        service = IngestionService(source, repo, logger=logger, max_workers=2)
+
+        repo.get_by_day.side_effect = lambda day: DailyIndex({
+            "hours_processed": {f"{day:%Y-%m-%d}-{h}": {} for h in range(24)}
+        })
+        writers = {date(2024, 1, 1): Mock(), date(2024, 1, 2): Mock()}
+        writers[date(2024, 1, 1)].consolidate_storage.side_effect = EventStorageError("disk full")
+        repo.get_writer_for_day.side_effect = writers.get
+
+        totals = service.process_time_range(datetime(2024, 1, 1, 23), datetime(2024, 1, 2, 0))
+
+        assert totals == (0, 0, 0)
+        source.iter_events.assert_not_called()
+        writers[date(2024, 1, 2)].consolidate_storage.assert_called_once()
+        warnings = [c.args[0] for c in logger.warning.call_args_list]
+        assert any("2024-01-01" in w and "disk full" in w for w in warnings)
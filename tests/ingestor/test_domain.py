@@ -54,4 +54,19 @@ class TestDomainEntities:
     def test_daily_index_mark_not_found(self):
         idx = DailyIndex({})
         idx.mark_hour_not_found("2024-01-01-11")
-        assert "2024-01-01-11" in idx.hours_not_found
\ No newline at end of file
+        assert "2024-01-01-11" in idx.hours_not_found
+
+    def test_daily_index_snapshot_sorts_not_found(self):
+        idx = DailyIndex({})
+        idx.mark_hour_not_found("2024-01-01-9")
+        idx.mark_hour_not_found("2024-01-01-11")
+        idx.mark_hour_not_found("2024-01-01-10")
+        idx.mark_hour("2024-01-01-11", {"total": 1})
+
+        assert idx.snapshot()["hours_not_found"] == ["2024-01-01-10", "2024-01-01-9"]
+
+    def test_daily_index_add_counts_merges_in_place(self):
+        idx = DailyIndex({"daily_counts": {"PushEvent": 2}})
+        idx.add_counts({"PushEvent": 3, "WatchEvent": 1})
+
+        assert idx.data["daily_counts"] == {"PushEvent": 5, "WatchEvent": 1}
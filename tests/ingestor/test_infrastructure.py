@@ -1,11 +1,16 @@
 import pytest
 import os
+import io
+import gzip
 import json
+import requests
 from datetime import date
 from src.ingestor.infrastructure.json_index_repository import JsonIngestionIndexRepository
 from src.ingestor.infrastructure.file_writer import DailyEventFileWriter
-from src.ingestor.infrastructure.fs_utils import Paths
+from src.ingestor.infrastructure.fs_utils import Paths, get_dataset_summary
+from src.ingestor.infrastructure.gharchive_source import GhArchiveEventSource
 from src.ingestor.domain.entities import DailyIndex, DistilledEvent
+from src.ingestor.application.errors import ArchiveNotFoundError, DataSourceError, EventStorageError
 
 class TestJsonRepository:
     def test_save_and_load(self, tmp_path):
@@ -17,10 +22,52 @@ class TestJsonRepository:
         repo.save(idx, d)
 
         assert (tmp_path / "2024/01/01/index.json").exists()
+        assert not (tmp_path / "2024/01/01/index.json.tmp").exists()
         
         loaded = repo.get_by_day(d)
         assert "2024-01-01-10" in loaded.hours_processed
 
+    def test_save_skips_unchanged_index(self, tmp_path):
+        repo = JsonIngestionIndexRepository(str(tmp_path))
+        d = date(2024, 1, 1)
+        index_file = tmp_path / "2024/01/01/index.json"
+
+        idx = DailyIndex({})
+        idx.mark_hour_not_found("2024-01-01-3")
+        repo.save(idx, d)
+        index_file.write_bytes(b"{}")
+
+        idx.mark_hour_not_found("2024-01-01-3")
+        repo.save(idx, d)
+        assert index_file.read_bytes() == b"{}"
+
+        idx.mark_hour("2024-01-01-3", {"total": 1})
+        repo.save(idx, d)
+        assert "2024-01-01-3" in repo.get_by_day(d).hours_processed
+
+    def test_lookup_does_not_create_day_dir(self, tmp_path):
+        repo = JsonIngestionIndexRepository(str(tmp_path))
+
+        loaded = repo.get_by_day(date(2024, 1, 1))
+
+        assert loaded.hours_processed == set()
+        assert not (tmp_path / "2024").exists()
+
+    def test_dataset_summary_coverage(self, tmp_path):
+        repo = JsonIngestionIndexRepository(str(tmp_path))
+        day_one = DailyIndex({})
+        day_one.mark_hour("2024-01-01-22", {"total": 1})
+        day_one.mark_hour("2024-01-01-23", {"total": 1})
+        repo.save(day_one, date(2024, 1, 1))
+        day_two = DailyIndex({})
+        day_two.mark_hour("2024-01-02-1", {"total": 1})
+        repo.save(day_two, date(2024, 1, 2))
+
+        summary = get_dataset_summary(str(tmp_path))
+
+        assert summary[:4] == ("2024-01-01-22", "2024-01-02-01", 3, 4)
+        assert summary[4] == pytest.approx(75.0)
+
 class TestFileWriter:
     def test_write_append_mode(self, tmp_path):
         """Verifica che il writer scriva sul file events.jsonl tramite il temp."""
@@ -36,6 +83,46 @@ class TestFileWriter:
             line = json.loads(f.readline())
             assert line["activity"] == "Push"
 
+    def test_write_buffers_until_close(self, tmp_path):
+        """Gli eventi restano nel buffer finché non si supera la soglia o si chiude il writer."""
+        paths = Paths(str(tmp_path), date(2024, 1, 1))
+        writer = DailyEventFileWriter(paths)
+
+        for i in range(3):
+            writer.write_event(DistilledEvent(str(i), "Push", "2024-01-01", i, "repo"))
+        assert os.path.getsize(paths.events_path) == 0
+
+        writer.close_ok()
+        with open(paths.events_path) as f:
+            assert [json.loads(line)["case_id"] for line in f] == ["0", "1", "2"]
+
+    def test_sync_every_forces_datasync(self, tmp_path, monkeypatch):
+        synced = []
+        monkeypatch.setattr("src.ingestor.infrastructure.file_writer._fdatasync", synced.append)
+        paths = Paths(str(tmp_path), date(2024, 1, 1))
+        writer = DailyEventFileWriter(paths, sync_every=1)
+
+        writer.write_event(DistilledEvent("1", "Push", "2024-01-01", 1, "r"))
+        writer.close_ok()
+
+        assert len(synced) == 1
+
+    @pytest.mark.skipif(not os.path.exists("/dev/full"), reason="richiede /dev/full")
+    def test_failed_write_is_raised_on_close(self, tmp_path):
+        paths = Paths(str(tmp_path), date(2024, 1, 1))
+        os.makedirs(paths.day_dir)
+        # /dev/full fallisce ogni scrittura con ENOSPC.
+        os.symlink("/dev/full", paths.events_path)
+        writer = DailyEventFileWriter(paths)
+
+        writer.write_event(DistilledEvent("1", "Push", "2024-01-01", 1, "r"))
+
+        with pytest.raises(EventStorageError):
+            writer.close_ok()
+        with pytest.raises(EventStorageError):
+            writer.write_event(DistilledEvent("2", "Push", "2024-01-01", 1, "r"))
+        writer.close_abort()
+
     def test_consolidate_lazy(self, tmp_path):
         """Verifica che consolidate converta JSONL in Parquet e rimuova l'originale."""
         paths = Paths(str(tmp_path), date(2024, 1, 1))
@@ -49,4 +136,115 @@ class TestFileWriter:
         writer.consolidate_storage()
         
         assert not os.path.exists(paths.events_path)
-        assert os.path.exists(paths.parquet_dir + "/events.parquet")
\ No newline at end of file
+        assert os.path.exists(paths.parquet_dir + "/events.parquet")
+
+class FakeArchiveResponse:
+    """Risposta HTTP minima con un corpo gzip reale, come quella di GH Archive."""
+
+    def __init__(self, body: bytes, status_code: int = 200):
+        self.status_code = status_code
+        self.raw = io.BytesIO(gzip.compress(body))
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+def serve_archive(monkeypatch, source, body: bytes, status_code: int = 200):
+    calls = []
+
+    def fake_get(*args, **kwargs):
+        calls.append(args)
+        return FakeArchiveResponse(body, status_code)
+
+    monkeypatch.setattr(source.session, "get", fake_get)
+    return calls
+
+class TestGhArchiveEventSource:
+    def test_iter_events_skips_malformed_lines(self, monkeypatch):
+        source = GhArchiveEventSource()
+        serve_archive(
+            monkeypatch, source,
+            b'{"id": "1", "type": "PushEvent"}\n{not json\n{"id": "2", "type": "WatchEvent"}\n'
+        )
+
+        events = list(source.iter_events("http://example/2024-01-01-0.json.gz"))
+
+        assert [e["id"] for e in events] == ["1", "2"]
+
+    def test_iter_events_keeps_lines_with_lone_surrogates(self, monkeypatch):
+        source = GhArchiveEventSource()
+        serve_archive(monkeypatch, source, b'{"id": "1", "payload": {"message": "fix \\ud83d x"}}\n{not json')
+
+        events = list(source.iter_events("http://example/2024-01-01-0.json.gz"))
+
+        assert [e["id"] for e in events] == ["1"]
+        assert events[0]["payload"]["message"] == "fix \ud83d x"
+
+    def test_iter_events_rebuilds_lines_across_chunks(self, monkeypatch):
+        source = GhArchiveEventSource(read_chunk_size=5)
+        serve_archive(monkeypatch, source, b'{"id": "1"}\n{"id": "22"}\n{"id": "333"}')
+
+        events = list(source.iter_events("http://example/2024-01-01-0.json.gz"))
+
+        assert [e["id"] for e in events] == ["1", "22", "333"]
+
+    def test_iter_events_raises_not_found_without_retry(self, monkeypatch):
+        source = GhArchiveEventSource()
+        calls = serve_archive(monkeypatch, source, b"", status_code=404)
+
+        with pytest.raises(ArchiveNotFoundError):
+            list(source.iter_events("http://example/2024-01-01-0.json.gz"))
+        assert len(calls) == 1
+
+    def test_connection_errors_are_retried_only_by_urllib3(self, monkeypatch):
+        calls = []
+
+        def refused_get(*args, **kwargs):
+            calls.append(args)
+            raise requests.exceptions.ConnectionError("refused")
+
+        source = GhArchiveEventSource(max_retries=3, pool_size=8)
+        monkeypatch.setattr(source.session, "get", refused_get)
+
+        with pytest.raises(DataSourceError):
+            list(source.iter_events("http://example/2024-01-01-0.json.gz"))
+
+        adapter = source.session.get_adapter("https://data.gharchive.org")
+        assert len(calls) == 1
+        assert adapter.max_retries.total == 2
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 8
+
+    def test_iter_events_resumes_after_truncated_stream_without_duplicates(self, monkeypatch):
+        payload = gzip.compress(b'{"id": 1}\n{"id": 2}\n{"id": 3}\n')
+        bodies = [payload[:-8], payload]
+
+        class FakeResponse:
+            status_code = 200
+
+            def __init__(self):
+                self.raw = io.BytesIO(bodies.pop(0))
+
+            def raise_for_status(self):
+                pass
+
+            def close(self):
+                pass
+
+        source = GhArchiveEventSource(backoff_base=0, read_chunk_size=8)
+        monkeypatch.setattr(source.session, "get", lambda *a, **kw: FakeResponse())
+
+        events = list(source.iter_events("http://example/2024-01-01-0.json.gz"))
+
+        assert [e["id"] for e in events] == [1, 2, 3]
+        assert bodies == []
+
+    def test_close_releases_session(self, monkeypatch):
+        source = GhArchiveEventSource()
+        closed = []
+        monkeypatch.setattr(source.session, "close", lambda: closed.append(True))
+
+        source.close()
+
+        assert closed == [True]
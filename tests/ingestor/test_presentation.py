@@ -43,4 +43,20 @@ class TestDatasetController:
         controller.run_hours(["2024-01-01-10", "bad-format"])
         
         service.process_single_hour.assert_called_once_with("2024-01-01-10")
-        service.finalize_daily_indexes.assert_called_once()
\ No newline at end of file
+        service.finalize_daily_indexes.assert_called_once()
+
+    def test_run_hours_parallel_aggregates_totals(self):
+        """Con più worker tutte le ore vengono processate e i totali sommati."""
+        service = Mock()
+        logger = Mock()
+
+        service.process_single_hour.return_value = ("SUCCESS", 10, 8, 2)
+
+        controller = DatasetController(service, logger, workers=4)
+
+        controller.run_hours(["2024-01-01-1", "2024-01-01-2", "2024-01-02-1"])
+
+        assert service.process_single_hour.call_count == 3
+        days = service.finalize_daily_indexes.call_args[0][0]
+        assert sorted(days) == [datetime(2024, 1, 1).date(), datetime(2024, 1, 2).date()]
+        logger.info.assert_called_with("Totale Sessione: Parsed=30, Distilled=24, Bad=6")
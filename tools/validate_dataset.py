@@ -19,8 +19,7 @@ def get_processed_hours_per_day(output_directory: Path) -> Dict[date, int]:
             day_str = "-".join(index_path.parts[-4:-1])
             current_date = datetime.strptime(day_str, "%Y-%m-%d").date()
             
-            with open(index_path, "r") as f:
-                data = json.load(f)
+            data = json.loads(index_path.read_bytes())
             
             hours_count = len(data.get("hours_processed", {}))
             if hours_count > 0: